@@ -1,8 +1,14 @@
 import os
-import yaml
+import copy
+import json
 from utils.error_handler import handle_error
 
-CONFIG_FILE = 'config.yaml'
+CONFIG_FILE = 'config.json'
+LEGACY_CONFIG_FILE = 'config.yaml'
+
+# In-process cache of the parsed configuration, keyed on the file mtime
+_CONFIG_CACHE = None
+_CONFIG_MTIME = None
 
 DEFAULT_CONFIG = {
     'settings': {
@@ -21,43 +27,111 @@ DEFAULT_CONFIG = {
     }
 }
 
-def load_config():
+def merge_defaults(config):
     """
-    Loads the configuration from the config file.
-    If the file doesn't exist, creates it with default values.
+    Fills in any settings missing from the configuration with default values.
+
+    Args:
+        config (dict): Configuration dictionary to update in place.
+    """
+    for key, value in DEFAULT_CONFIG['settings'].items():
+        if key not in config.get('settings', {}):
+            config['settings'][key] = value
+
+def migrate_legacy_config():
+    """
+    Converts a legacy config.yaml into config.json, once.
+    Only runs when the YAML file exists and the JSON file does not.
 
     Returns:
-        dict: Configuration dictionary.
+        bool: True if a legacy config was migrated.
     """
-    if not os.path.exists(CONFIG_FILE):
-        save_config(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG
+    if os.path.exists(CONFIG_FILE) or not os.path.exists(LEGACY_CONFIG_FILE):
+        return False
 
     try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        import yaml
+        with open(LEGACY_CONFIG_FILE, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
+        if config is None:
+            return False
+        merge_defaults(config)
+        validate_config(config)
+        save_config(config)
+        return True
+    except Exception as e:
+        handle_error(e, "Failed to migrate legacy configuration")
+
+def _load_cached_config():
+    """
+    Returns the cached configuration, re-reading the config file first when it
+    has not been read yet or its modification time has changed.
+    The returned dict is the cache itself and must not be modified.
+
+    Returns:
+        dict: Cached configuration dictionary.
+    """
+    global _CONFIG_CACHE, _CONFIG_MTIME
+
+    if _CONFIG_CACHE is None:
+        migrate_legacy_config()
+
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime
+    except FileNotFoundError:
+        config = copy.deepcopy(DEFAULT_CONFIG)
+        save_config(config)
+        return config
+
+    if _CONFIG_CACHE is not None and mtime == _CONFIG_MTIME:
+        return _CONFIG_CACHE
+
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            config = json.load(f)
             if config is None:
-                config = DEFAULT_CONFIG
-            # Merge with defaults
-            for key, value in DEFAULT_CONFIG['settings'].items():
-                if key not in config.get('settings', {}):
-                    config['settings'][key] = value
+                config = copy.deepcopy(DEFAULT_CONFIG)
+            merge_defaults(config)
             # Validate configuration
             validate_config(config)
+            _CONFIG_CACHE = config
+            _CONFIG_MTIME = mtime
             return config
     except Exception as e:
         handle_error(e, "Failed to load configuration")
 
+def load_config():
+    """
+    Loads the configuration from the config file.
+    If the file doesn't exist, creates it with default values.
+    The parsed configuration is cached and only re-read when the file's
+    modification time changes. Each call returns its own copy, so callers
+    can modify it without changing the cache before it is saved.
+
+    Returns:
+        dict: Configuration dictionary.
+    """
+    return copy.deepcopy(_load_cached_config())
+
 def save_config(config):
     """
     Saves the configuration to the config file.
+    The file is written to a temporary path and then atomically renamed,
+    so an interrupted save never leaves a truncated config behind.
 
     Args:
         config (dict): Configuration dictionary to save.
     """
+    global _CONFIG_CACHE, _CONFIG_MTIME
+
+    tmp_file = CONFIG_FILE + '.tmp'
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp_file, CONFIG_FILE)
+        # Cache a copy, so later changes to the caller's dict are not cached unsaved
+        _CONFIG_CACHE = copy.deepcopy(config)
+        _CONFIG_MTIME = os.stat(CONFIG_FILE).st_mtime
     except Exception as e:
         handle_error(e, "Failed to save configuration")
 
@@ -92,8 +166,8 @@ def get_setting(key):
     Returns:
         Value of the setting.
     """
-    config = load_config()
-    return config['settings'].get(key)
+    # Read from the cache directly; only the returned value is copied
+    return copy.deepcopy(_load_cached_config()['settings'].get(key))
 def get_last_extraction_params():
     """
     Retrieves the last extraction parameters.
@@ -101,8 +175,7 @@ def get_last_extraction_params():
     Returns:
         dict or None: Last extraction parameters, or None if not set.
     """
-    config = load_config()
-    return config['settings'].get('last_extraction_params')
+    return copy.deepcopy(_load_cached_config()['settings'].get('last_extraction_params'))
 
 def save_last_extraction_params(params):
     """
@@ -1,10 +1,100 @@
 import logging
 import re
 import os
+import collections
 import concurrent.futures
 from ebooklib import epub
 from utils.error_handler import InvalidEpubError, ChapterNotFoundError
-from config_manager import get_setting
+from config_manager import get_setting, load_config
+from search_replace_processor import apply_search_replace, compile_search_replace_terms, compile_search_replace_prefilter, encode_search_replace_terms
+
+# Patterns used while scanning chapters, compiled once at import time
+_TAG_RE = re.compile(r'<[^>]+>')
+_TAG_BYTES_RE = re.compile(rb'<[^>]+>')
+_TITLE_TAG_BYTES_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE)
+_HEADING_BYTES_RE = re.compile(rb'<h[1-6][^>]*>(.*?)</h[1-6]>', re.IGNORECASE)
+_FILENAME_NUM_RE = re.compile(r'_(\d+)_')
+_CHAPTER_NUM_RE = re.compile(r'^Chapter (\d+)', re.IGNORECASE)
+_HTML_MEDIA_TYPES = ('application/xhtml+xml', 'text/html')
+# <title> sits in <head>, so it is looked for in this many leading characters first
+_HEAD_SCAN_SIZE = 4096
+_EXCLUSION_RE = re.compile(r'cover|info|toc|contents|copyright|acknowledgment')
+
+def _search_head(pattern, content):
+    """
+    Searches the start of a document first, then the whole document.
+
+    Meant for patterns like <title> whose match, if any, is near the start and
+    cannot span a line break, so the head result equals a full search.
+
+    Args:
+        pattern (re.Pattern): Compiled pattern, str or bytes to match content.
+        content (str or bytes): Document content.
+
+    Returns:
+        re.Match or None: The first match.
+    """
+    match = pattern.search(content, 0, _HEAD_SCAN_SIZE)
+    if match is None and len(content) > _HEAD_SCAN_SIZE:
+        match = pattern.search(content)
+    return match
+
+def _leading_number(text):
+    """
+    Parses a leading 'N:' chapter number, e.g. '12: The Return' -> 12.
+
+    Plain string scan equivalent to matching r'^(\d+):'.
+
+    Args:
+        text (str): Text to parse.
+
+    Returns:
+        int or None: The number, or None if text does not start with digits and a colon.
+    """
+    end = 0
+    while end < len(text) and text[end].isdecimal():
+        end += 1
+    if end and text[end:end + 1] == ':':
+        return int(text[:end])
+    return None
+
+def _count_words(content, limit=None):
+    """
+    Counts whitespace-separated words in HTML content, ignoring tags.
+
+    Equivalent to len(tag_stripped.split()) without building the stripped copy,
+    and stops early once limit words have been seen.
+
+    Args:
+        content (str or bytes): HTML content.
+        limit (int, optional): Stop counting once this many words are found.
+
+    Returns:
+        int: Word count, capped at limit if given.
+    """
+    tag_re = _TAG_BYTES_RE if isinstance(content, bytes) else _TAG_RE
+    count = 0
+    pos = 0
+    # Whether the text before the last tag ended mid-word, e.g. 'wo<b>rd'
+    in_word = False
+    for match in tag_re.finditer(content):
+        segment = content[pos:match.start()]
+        pos = match.end()
+        if segment:
+            words = len(segment.split())
+            if words and in_word and not segment[:1].isspace():
+                words -= 1
+            count += words
+            in_word = not segment[-1:].isspace()
+            if limit is not None and count >= limit:
+                return limit
+    segment = content[pos:]
+    if segment:
+        words = len(segment.split())
+        if words and in_word and not segment[:1].isspace():
+            words -= 1
+        count += words
+    return count if limit is None else min(count, limit)
 
 class EpubProcessor:
     """
@@ -20,33 +110,65 @@ class EpubProcessor:
         """
         self.file_path = file_path
         self.book = None
-        self.chapters = []
-        self.real_chapter_numbers = []
-        self.real_to_index = {}
+        self._chapters = None
+        self._real_chapter_numbers = []
+        self._real_to_index = {}
+        self._text_cache = {}
+        self._title_cache = {}
+        self._items_by_id = {}
+        self._html_items = []
         self.load_book()
 
     def load_book(self):
         """
-        Loads the EPUB book and extracts chapters.
+        Loads the EPUB book. Chapters are scanned lazily on first access.
         """
         try:
+            self._text_cache.clear()
+            self._title_cache.clear()
+            self._chapters = None
             self.book = epub.read_epub(self.file_path)
-            self.chapters = self.get_chapters()
-            # Populate real chapter numbers
-            for idx, item in enumerate(self.chapters):
-                num, method, source = self.extract_chapter_number(item)
-                self.real_chapter_numbers.append(num)
-                logging.debug(f"Chapter index {idx}: source='{source}', extracted={num}, method={method}")
-                if num is not None:
-                    self.real_to_index[num] = idx
-                    logging.debug(f"Chapter index {idx}: real number {num}, filename {item.get_name()}")
-                else:
-                    logging.info(f"Chapter index {idx}: no real number extracted, filename {item.get_name()}")
-            logging.debug(f"Real to index mapping: {self.real_to_index}")
+            # Index items by id once; book.get_item_with_id is a linear scan
+            self._items_by_id = {}
+            for item in self.book.get_items():
+                self._items_by_id.setdefault(item.id, item)
+            self._html_items = [item for item in self.book.get_items() if item.media_type in _HTML_MEDIA_TYPES]
             logging.info(f"Loaded EPUB file: {self.file_path}")
         except Exception as e:
             raise InvalidEpubError(f"Failed to load EPUB: {str(e)}")
 
+    def _ensure_chapters(self):
+        """
+        Scans the spine for chapters if that has not been done yet.
+
+        Raises:
+            InvalidEpubError: If the chapters cannot be scanned.
+        """
+        if self._chapters is None:
+            try:
+                self._chapters = self.get_chapters()
+            except Exception as e:
+                raise InvalidEpubError(f"Failed to load EPUB: {str(e)}")
+            logging.debug("Real to index mapping: %s", self._real_to_index)
+
+    @property
+    def chapters(self):
+        """list: Chapter items, scanned on first access."""
+        self._ensure_chapters()
+        return self._chapters
+
+    @property
+    def real_chapter_numbers(self):
+        """list: Real chapter number (or None) for each chapter index."""
+        self._ensure_chapters()
+        return self._real_chapter_numbers
+
+    @property
+    def real_to_index(self):
+        """dict: Mapping from real chapter number to 0-based chapter index."""
+        self._ensure_chapters()
+        return self._real_to_index
+
     def extract_chapter_number(self, item):
         """
         Extracts the real chapter number from the item's title, content, or filename.
@@ -57,43 +179,42 @@ class EpubProcessor:
             tuple: (int or None, str, str) - The real chapter number, method used, source text.
         """
         filename = item.get_name()
-        logging.debug(f"Extracting chapter number for item: {filename}")
+        logging.debug("Extracting chapter number for item: %s", filename)
 
         # Check filename first: match '_(\d+)_'
-        filename_match = re.search(r'_(\d+)_', filename)
-        logging.debug(f"Filename regex match: {filename_match}")
+        filename_match = _FILENAME_NUM_RE.search(filename)
+        logging.debug("Filename regex match: %s", filename_match)
         if filename_match:
             extracted = int(filename_match.group(1))
-            logging.debug(f"Extracted from filename: {extracted}")
+            logging.debug("Extracted from filename: %s", extracted)
             return extracted, 'filename', filename
         else:
             logging.debug("Filename does not match '_(\\d+)_', falling back to title")
 
         # Else, check title: match '^(\d+):'
-        logging.debug(f"item.title exists: {item.title is not None}, value: {item.title}")
+        logging.debug("item.title exists: %s, value: %s", item.title is not None, item.title)
         if item.title:
-            title_match = re.match(r'^(\d+):', item.title.strip())
-            logging.debug(f"Title regex match: {title_match}")
-            if title_match:
-                extracted = int(title_match.group(1))
-                logging.debug(f"Extracted from title: {extracted}")
+            extracted = _leading_number(item.title.strip())
+            logging.debug("Title number match: %s", extracted)
+            if extracted is not None:
+                logging.debug("Extracted from title: %s", extracted)
                 return extracted, 'title', item.title.strip()
             else:
                 logging.debug("Title exists but does not match regex '^(\\d+):', falling back")
         else:
             logging.debug("No item.title, falling back to <title> tag")
 
-        # Else, parse content for <title> tag
-        content = item.get_content().decode('utf-8', errors='ignore')
-        title_tag_match = re.search(r'<title[^>]*>(.*?)</title>', content, re.IGNORECASE)
-        logging.debug(f"<title> tag found: {title_tag_match is not None}, full match: {title_tag_match.group(0) if title_tag_match else None}, extracted text: {title_tag_match.group(1).strip() if title_tag_match else None}")
+        # Else, parse raw content for <title> tag; only the matched text is decoded
+        raw = item.get_content()
+        title_tag_match = _search_head(_TITLE_TAG_BYTES_RE, raw)
+        title_text = title_tag_match.group(1).decode('utf-8', errors='ignore').strip() if title_tag_match else None
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("<title> tag found: %s, full match: %s, extracted text: %s", title_tag_match is not None, title_tag_match.group(0).decode('utf-8', errors='ignore') if title_tag_match else None, title_text)
         if title_tag_match:
-            title_text = title_tag_match.group(1).strip()
-            num_match = re.match(r'^(\d+):', title_text)
-            logging.debug(f"<title> text regex match: {num_match}")
-            if num_match:
-                extracted = int(num_match.group(1))
-                logging.debug(f"Extracted from <title> tag: {extracted}")
+            extracted = _leading_number(title_text)
+            logging.debug("<title> text number match: %s", extracted)
+            if extracted is not None:
+                logging.debug("Extracted from <title> tag: %s", extracted)
                 return extracted, 'title_tag', title_text
             else:
                 logging.debug("<title> tag found but text does not match regex, falling back")
@@ -101,12 +222,13 @@ class EpubProcessor:
             logging.debug("No <title> tag found, falling back to content")
 
         # Else, parse content text for "Chapter (\d+)" in first 200 chars
-        content_start = content[:200]
-        content_match = re.match(r'^Chapter (\d+)', content_start, re.IGNORECASE)
-        logging.debug(f"Content regex match: {content_match}")
+        # (200 characters span at most 800 UTF-8 bytes)
+        content_start = raw[:800].decode('utf-8', errors='ignore')[:200]
+        content_match = _CHAPTER_NUM_RE.match(content_start)
+        logging.debug("Content regex match: %s", content_match)
         if content_match:
             extracted = int(content_match.group(1))
-            logging.debug(f"Extracted from content: {extracted}")
+            logging.debug("Extracted from content: %s", extracted)
             return extracted, 'content', content_start
         else:
             logging.debug("No '^Chapter (\\d+)' found in first 200 chars of content")
@@ -114,52 +236,116 @@ class EpubProcessor:
         logging.info(f"No chapter number extracted for {filename}")
         return None, 'none', ''
 
+    def _get_item_text(self, item, cache=True):
+        """
+        Returns the decoded text of an EPUB item, decoding it at most once.
+
+        Args:
+            item (EpubItem): The EPUB item.
+            cache (bool): Whether to keep newly decoded text for later calls.
+
+        Returns:
+            str: Decoded item content.
+        """
+        text = self._text_cache.get(item)
+        if text is None:
+            text = item.get_content().decode('utf-8', errors='ignore')
+            if cache:
+                self._text_cache[item] = text
+        return text
+
+    def _scan_chapter_item(self, item):
+        """
+        Decides whether a spine item is a chapter and extracts its real number.
+
+        Safe to run concurrently for different items.
+
+        Args:
+            item (EpubHtml): Spine item that passed the exclusion keyword check.
+
+        Returns:
+            tuple or None: (real_num, method, source), or None if the item is not a chapter.
+        """
+        filename = item.get_name()
+        # Count words on the raw bytes when they are pure ASCII; otherwise on the
+        # decoded text, since bytes.split() misses Unicode spaces such as U+00A0.
+        # Counting stops at 200, past which the count no longer changes the outcome
+        content = item.get_content()
+        if not content.isascii():
+            content = self._get_item_text(item, cache=False)
+        word_count = _count_words(content, limit=200)
+        if word_count < 100:
+            logging.debug("Excluded file: %s, reason: content too short (%s words)", filename, word_count)
+            return None
+        # Check if it appears to be a chapter
+        is_chapter = filename[:1].isdecimal() or 'chapter' in filename.lower()
+        if not (is_chapter or word_count >= 200):
+            logging.debug("Excluded file: %s, reason: does not appear to be a chapter (no numeric prefix, no 'chapter' in name, and content not substantial)", filename)
+            return None
+        return self.extract_chapter_number(item)
+
     def get_chapters(self):
         """
         Retrieves filtered chapter items from the EPUB, excluding non-chapter files.
 
+        The real chapter numbers and the real-to-index mapping of the included
+        chapters are recorded in the same pass. Spine items are
+        scanned in parallel when parallel processing is enabled.
+
         Returns:
             list: List of EpubHtml items representing actual chapters.
         """
         chapters = []
-        # Get spine entries
-        spine_ids = [spine_entry[0] for spine_entry in self.book.spine]
-        logging.debug(f"Spine IDs: {spine_ids}")
+        self._real_chapter_numbers = []
+        self._real_to_index = {}
+        logging.debug("Spine IDs: %s", [spine_entry[0] for spine_entry in self.book.spine])
         # Get HTML items from spine that have HTML media types
-        html_media_types = ['application/xhtml+xml', 'text/html']
-        exclusion_keywords = ['cover', 'info', 'toc', 'contents', 'copyright', 'acknowledgment']
-        for spine_id in spine_ids:
-            item = self.book.get_item_with_id(spine_id)
-            if item and item.media_type in html_media_types:
+        candidates = []
+        for spine_id, _ in self.book.spine:
+            item = self._items_by_id.get(spine_id)
+            if item and item.media_type in _HTML_MEDIA_TYPES:
                 filename = item.get_name()
-                logging.debug(f"Processing spine item: {filename}")
+                logging.debug("Processing spine item: %s", filename)
                 # Check for exclusion keywords in filename
-                if any(kw in filename.lower() for kw in exclusion_keywords):
-                    logging.debug(f"Excluded file: {filename}, reason: contains exclusion keyword")
+                if _EXCLUSION_RE.search(filename.lower()):
+                    logging.debug("Excluded file: %s, reason: contains exclusion keyword", filename)
                     continue
-                # Get content and check word count
-                content = item.get_content().decode('utf-8', errors='ignore')
-                content_no_tags = re.sub(r'<[^>]+>', '', content)
-                words = content_no_tags.split()
-                word_count = len(words)
-                if word_count < 100:
-                    logging.debug(f"Excluded file: {filename}, reason: content too short ({word_count} words)")
-                    continue
-                # Check if it appears to be a chapter
-                is_chapter = re.match(r'^\d+', filename) or 'chapter' in filename.lower()
-                if not (is_chapter or word_count >= 200):
-                    logging.debug(f"Excluded file: {filename}, reason: does not appear to be a chapter (no numeric prefix, no 'chapter' in name, and content not substantial)")
-                    continue
-                logging.debug(f"Including chapter: {filename}")
-                chapters.append(item)
+                candidates.append(item)
 
-        logging.debug(f"Filtered chapters: {[item.get_name() for item in chapters]}")
-        logging.debug(f"Final chapters count: {len(chapters)}")
+        # Scan candidates, in parallel if enabled; results keep spine order
+        if get_setting('enable_parallel_processing') and len(candidates) > 1:
+            max_workers = get_setting('max_workers') or min(os.cpu_count() or 4, len(candidates))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._scan_chapter_item, candidates))
+        else:
+            results = [self._scan_chapter_item(item) for item in candidates]
+
+        for item, result in zip(candidates, results):
+            if result is None:
+                continue
+            num, method, source = result
+            filename = item.get_name()
+            logging.debug("Including chapter: %s", filename)
+            idx = len(chapters)
+            chapters.append(item)
+            # Populate real chapter number
+            self._real_chapter_numbers.append(num)
+            logging.debug("Chapter index %s: source='%s', extracted=%s, method=%s", idx, source, num, method)
+            if num is not None:
+                self._real_to_index[num] = idx
+                logging.debug("Chapter index %s: real number %s, filename %s", idx, num, filename)
+            else:
+                logging.info(f"Chapter index {idx}: no real number extracted, filename {filename}")
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Filtered chapters: %s", [item.get_name() for item in chapters])
+        logging.debug("Final chapters count: %s", len(chapters))
         return chapters
 
     def get_chapter_title(self, chapter_num):
         """
         Gets the title of the specified chapter.
+        Titles are cached per chapter after the first lookup.
 
         Args:
             chapter_num (int): Chapter number (1-based).
@@ -170,28 +356,48 @@ class EpubProcessor:
         Raises:
             ChapterNotFoundError: If chapter not found.
         """
-        if 1 <= chapter_num <= len(self.chapters):
-            item = self.chapters[chapter_num - 1]
-            # Try to get title from item, fallback to filename or generic
-            title = item.title
-            if not title:
-                # Extract from content if possible (basic)
-                content = item.get_content().decode('utf-8', errors='ignore')
-                # Try <title> tag first
-                match = re.search(r'<title[^>]*>(.*?)</title>', content, re.IGNORECASE)
+        if chapter_num in self._title_cache:
+            return self._title_cache[chapter_num]
+        item = self._get_chapter_item(chapter_num)
+        # Try to get title from item, fallback to filename or generic
+        title = item.title
+        if not title:
+            # Extract from the raw content if possible (basic); only the match is decoded
+            raw = item.get_content()
+            # Try <title> tag first
+            match = _search_head(_TITLE_TAG_BYTES_RE, raw)
+            if match:
+                title = match.group(1).decode('utf-8', errors='ignore').strip()
+            else:
+                # Simple title extraction (first h1, h2, etc.)
+                match = _HEADING_BYTES_RE.search(raw)
                 if match:
-                    title = match.group(1).strip()
-                else:
-                    # Simple title extraction (first h1, h2, etc.)
-                    match = re.search(r'<h[1-6][^>]*>(.*?)</h[1-6]>', content, re.IGNORECASE)
-                    if match:
-                        title = match.group(1).strip()
-            if not title:
-                real_num = self.get_real_chapter_number(chapter_num - 1)
-                title = f"Chapter {real_num if real_num is not None else chapter_num}"
-            return title
-        else:
-            raise ChapterNotFoundError(f"Chapter {chapter_num} not found")
+                    title = match.group(1).decode('utf-8', errors='ignore').strip()
+        if not title:
+            real_num = self.get_real_chapter_number(chapter_num - 1)
+            title = f"Chapter {real_num if real_num is not None else chapter_num}"
+        self._title_cache[chapter_num] = title
+        return title
+
+    def _get_chapter_item(self, chapter_num):
+        """
+        Gets the EPUB item of the specified chapter.
+
+        Args:
+            chapter_num (int): Chapter number (1-based).
+
+        Returns:
+            EpubHtml: The chapter item.
+
+        Raises:
+            ChapterNotFoundError: If chapter not found.
+        """
+        if chapter_num >= 1:
+            try:
+                return self.chapters[chapter_num - 1]
+            except IndexError:
+                pass
+        raise ChapterNotFoundError(f"Chapter {chapter_num} not found")
 
     def get_chapter_content(self, chapter_num):
         """
@@ -206,11 +412,7 @@ class EpubProcessor:
         Raises:
             ChapterNotFoundError: If chapter not found.
         """
-        if 1 <= chapter_num <= len(self.chapters):
-            item = self.chapters[chapter_num - 1]
-            return item.get_content().decode('utf-8', errors='ignore')
-        else:
-            raise ChapterNotFoundError(f"Chapter {chapter_num} not found")
+        return self._get_item_text(self._get_chapter_item(chapter_num))
 
     def get_total_chapters(self):
         """
@@ -245,93 +447,113 @@ class EpubProcessor:
         Returns:
             int: Number of items processed.
         """
-        from search_replace_processor import apply_search_replace
 
-        # Retrieve performance settings from config
-        enable_parallel_processing = get_setting('enable_parallel_processing')
-        enable_content_filtering = get_setting('enable_content_filtering')
-        min_word_count_threshold = get_setting('min_word_count_threshold')
-        exclusion_keywords = get_setting('exclusion_keywords') or ['cover', 'info', 'toc', 'contents', 'copyright', 'acknowledgment']
+        # Retrieve performance settings from a single config snapshot
+        settings = load_config()['settings']
+        enable_parallel_processing = settings.get('enable_parallel_processing')
+        enable_content_filtering = settings.get('enable_content_filtering')
+        min_word_count_threshold = settings.get('min_word_count_threshold')
+        exclusion_keywords = settings.get('exclusion_keywords')
+        # Match all exclusion keywords in one scan of the filename
+        if exclusion_keywords:
+            exclusion_re = re.compile('|'.join(map(re.escape, exclusion_keywords)))
+        else:
+            exclusion_re = _EXCLUSION_RE
 
         # Collect processable items
         processable_items = []
-        items = list(self.book.get_items())
-        logging.debug(f"Total items in EPUB: {len(items)}")
-
-        for item in items:
-            if item.media_type in ['application/xhtml+xml', 'text/html']:
-                filename = item.get_name()
-                # Check for exclusion keywords in filename
-                if any(kw in filename.lower() for kw in exclusion_keywords):
-                    logging.debug(f"Skipped non-content file: {filename}, reason: contains exclusion keyword")
+        logging.debug("Total items in EPUB: %s", len(self.book.items))
+
+        for item in self._html_items:
+            filename = item.get_name()
+            # Check for exclusion keywords in filename
+            if exclusion_re.search(filename.lower()):
+                logging.debug("Skipped non-content file: %s, reason: contains exclusion keyword", filename)
+                continue
+            if enable_content_filtering:
+                # Content filtering: check word count
+                word_count = _count_words(self._get_item_text(item, cache=False), limit=min_word_count_threshold)
+                if word_count < min_word_count_threshold:
+                    logging.debug("Skipped file: %s, reason: content too short (%s words)", filename, word_count)
                     continue
-                if enable_content_filtering:
-                    # Content filtering: check word count
-                    content = item.get_content().decode('utf-8', errors='ignore')
-                    content_no_tags = re.sub(r'<[^>]+>', '', content)
-                    words = content_no_tags.split()
-                    word_count = len(words)
-                    if word_count < min_word_count_threshold:
-                        logging.debug(f"Skipped file: {filename}, reason: content too short ({word_count} words)")
-                        continue
-                else:
-                    content = item.get_content().decode('utf-8', errors='ignore')
-                processable_items.append((item, filename, content))
+            # Content is decoded only when the item is processed, so the whole
+            # book's text is never held at once
+            processable_items.append((item, filename))
 
         logging.info(f"Found {len(processable_items)} processable HTML items for term replacement")
 
         if not processable_items:
             return 0
 
-        # Define helper function for processing individual items
-        def process_item(item_data):
-            item, filename, content = item_data
+        # Plain literal terms are applied to the raw UTF-8 content, which skips
+        # decoding each item and re-encoding the result
+        byte_terms = encode_search_replace_terms(terms)
+        if byte_terms is not None:
+            terms = byte_terms
+
+        def get_content(item):
+            if byte_terms is not None:
+                return item.get_content()
+            return self._get_item_text(item, cache=False)
+
+        # Compile the terms once for all items
+        compiled_terms = compile_search_replace_terms(terms)
+        prefilter = compile_search_replace_prefilter(terms)
+
+        def replace_item(item):
+            content = get_content(item)
+            # Items in which no term occurs are left alone
+            if prefilter is not None and not prefilter.search(content):
+                return None
+            replaced_content = apply_search_replace(content, terms, compiled_terms)
+            return replaced_content if replaced_content != content else None
+
+        def update_item(item, filename, replaced_content):
+            if replaced_content is not None:
+                if isinstance(replaced_content, str):
+                    replaced_content = replaced_content.encode('utf-8')
+                item.set_content(replaced_content)
+                self._text_cache.pop(item, None)
+                logging.debug("Applied replacements to item: %s", filename)
+
+        processed_count = 0
+        total = len(processable_items)
+        # Log progress about 20 times per run rather than every 10 items
+        progress_interval = max(1, total // 20)
+
+        def finish_item(item, filename, get_replaced_content):
+            nonlocal processed_count
             try:
-                logging.info(f"Processing item: {filename}")
-                replaced_content = apply_search_replace(content, terms)
-                if replaced_content != content:
-                    # Ensure thread-safe content update
-                    item.set_content(replaced_content.encode('utf-8'))
-                    logging.debug(f"Applied replacements to item: {filename}")
-                    return True  # Indicates content was modified
-                return False
+                update_item(item, filename, get_replaced_content())
             except Exception as e:
                 logging.error(f"Error processing item {filename}: {str(e)}")
-                return False
-
-        # Use ThreadPoolExecutor for parallel processing if enabled
-        processed_count = 0
+            processed_count += 1  # Still count as processed even if failed
+            if processed_count % progress_interval == 0 or processed_count == total:
+                logging.info("Progress: %d/%d items processed", processed_count, total)
 
         if enable_parallel_processing:
-            max_workers = get_setting('max_workers') or min(os.cpu_count() or 4, len(processable_items))
+            # Worker threads share the compiled terms; the items themselves are
+            # only updated here, in order
+            max_workers = settings.get('max_workers') or min(os.cpu_count() or 4, total)
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all tasks
-                future_to_item = {executor.submit(process_item, item_data): item_data[1] for item_data in processable_items}
-
-                # Process completed tasks
-                for future in concurrent.futures.as_completed(future_to_item):
-                    filename = future_to_item[future]
-                    try:
-                        was_modified = future.result()
-                        processed_count += 1
-                        if processed_count % 10 == 0 or processed_count == len(processable_items):
-                            logging.info(f"Progress: {processed_count}/{len(processable_items)} items processed")
-                    except Exception as e:
-                        logging.error(f"Error processing item {filename}: {str(e)}")
-                        processed_count += 1  # Still count as processed even if failed
+                # Keep a bounded number of items in flight so their replaced contents are not all held at once
+                pending = collections.deque()
+                for item, filename in processable_items:
+                    logging.debug("Processing item: %s", filename)
+                    future = executor.submit(replace_item, item)
+                    pending.append((item, filename, future.result))
+                    if len(pending) >= 2 * max_workers:
+                        finish_item(*pending.popleft())
+                while pending:
+                    finish_item(*pending.popleft())
         else:
             # Sequential processing
-            for item_data in processable_items:
-                filename = item_data[1]
-                try:
-                    was_modified = process_item(item_data)
-                    processed_count += 1
-                    if processed_count % 10 == 0 or processed_count == len(processable_items):
-                        logging.info(f"Progress: {processed_count}/{len(processable_items)} items processed")
-                except Exception as e:
-                    logging.error(f"Error processing item {filename}: {str(e)}")
-                    processed_count += 1  # Still count as processed even if failed
+            for item, filename in processable_items:
+                logging.debug("Processing item: %s", filename)
+                finish_item(item, filename, lambda: replace_item(item))
 
+        # Titles may have been derived from content that has just been rewritten
+        self._title_cache.clear()
         logging.info(f"Completed processing: {processed_count} HTML items processed for term replacement")
         return processed_count
     def get_real_chapter_number(self, index):
@@ -355,11 +577,13 @@ class EpubProcessor:
         Returns:
             str: Range string, or empty if no real numbers.
         """
-        real_nums = [num for num in self.real_chapter_numbers if num is not None]
+        # real_to_index is keyed by exactly the non-None real numbers, so
+        # min/max run over its keys in C without filtering out None first
+        real_nums = self.real_to_index
         if not real_nums:
             return ""
         min_num = min(real_nums)
         max_num = max(real_nums)
         if min_num == max_num:
             return str(min_num)
-        return f"{min_num}-{max_num}"
\ No newline at end of file
+        return f"{min_num}-{max_num}"
@@ -1,8 +1,29 @@
 import os
 import json
 import re
+import heapq
 from utils.validators import validate_json_file, validate_search_replace_term
 from utils.error_handler import SearchReplaceError
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional; case-sensitive literal terms fall back to a regex alternation
+    ahocorasick = None
+
+try:
+    # Faster JSON parsing of large term files
+    import orjson
+except ImportError:
+    orjson = None
+
+# Validated terms per (JSON path, EPUB path), keyed on the JSON file's mtime
+_TERMS_CACHE = {}
+
+# A positive lookbehind, and the quantifiers that make its width variable
+_LOOKBEHIND_RE = re.compile(r'\(\?<=([^)]*)\)')
+_VARIABLE_WIDTH_RE = re.compile(r'[\+\*]|{\d+,')
+
 def fix_variable_lookbehind(pattern):
     """
     Fixes variable-width lookbehind patterns by refactoring them into fixed-width alternatives or using capturing groups for variable-width.
@@ -17,7 +38,7 @@ def fix_variable_lookbehind(pattern):
         str: The fixed pattern, or the original if no fix is needed.
     """
     # Match lookbehind: (?<=content)
-    lookbehind_match = re.search(r'\(\?<=([^)]*)\)', pattern)
+    lookbehind_match = _LOOKBEHIND_RE.search(pattern)
     if not lookbehind_match:
         return pattern
 
@@ -42,7 +63,7 @@ def fix_variable_lookbehind(pattern):
             new_patterns.append(new_pattern)
 
         return '|'.join(new_patterns)
-    elif re.search(r'[\+\*]|{\d+,', lb_content):
+    elif _VARIABLE_WIDTH_RE.search(lb_content):
         # Variable-width (has quantifiers), use capturing groups
         lb_end = lookbehind_match.end()
         match_part = pattern[lb_end:]
@@ -59,6 +80,7 @@ def load_search_replace_terms(file_path, epub_path=None):
     Loads and validates search-replace terms from a JSON file.
 
     Supports both old format (direct array of term objects) and new nested object format.
+    Validated terms are cached and only re-read when the file's modification time changes.
 
     Args:
         file_path (str): Path to the JSON file.
@@ -70,10 +92,23 @@ def load_search_replace_terms(file_path, epub_path=None):
         SearchReplaceError: If loading or validation fails.
     """
     try:
+        cache_key = (os.path.abspath(file_path), epub_path)
+        try:
+            mtime = os.stat(file_path).st_mtime
+        except OSError:
+            mtime = None
+        cached = _TERMS_CACHE.get(cache_key)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            return list(cached[1])
+
         validate_json_file(file_path)
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
         if isinstance(data, list):
             # Old format
@@ -101,7 +136,9 @@ def load_search_replace_terms(file_path, epub_path=None):
             validated_term = validate_search_replace_term(term)
             validated_terms.append(validated_term)
 
-        return validated_terms
+        if mtime is not None:
+            _TERMS_CACHE[cache_key] = (mtime, validated_terms)
+        return list(validated_terms)
 
     except json.JSONDecodeError as e:
         raise SearchReplaceError(f"Invalid JSON format: {str(e)}")
@@ -110,19 +147,45 @@ def load_search_replace_terms(file_path, epub_path=None):
 
 
 
-def apply_search_replace(text, terms):
+def _automaton_spans(automaton, text):
     """
-    Applies search-replace terms to the given text using batched replacement to handle overlaps and prioritization.
+    Finds leftmost-longest, non-overlapping matches of an Aho-Corasick automaton.
+
+    Gives the same spans as finditer over the longest-first alternation built by
+    compile_search_replace_terms, in one pass regardless of the number of terms.
+
+    Args:
+        automaton (ahocorasick.Automaton): Automaton whose values are key lengths.
+        text (str): Text to search.
+
+    Returns:
+        list: (start, end) tuples in ascending order.
+    """
+    matches = sorted((end - key_len + 1, -key_len) for end, key_len in automaton.iter(text))
+    spans = []
+    last_end = 0
+    for start, neg_len in matches:
+        if start >= last_end:
+            last_end = start - neg_len
+            spans.append((start, last_end))
+    return spans
+
+def compile_search_replace_terms(terms):
+    """
+    Compiles search-replace terms into the patterns used by apply_search_replace.
+
+    Simple terms are grouped by case sensitivity and whole-word matching into one
+    alternation per group. Compiling once and passing the result to
+    apply_search_replace avoids rebuilding the patterns for every text.
 
     Args:
-        text (str): The original text to process.
         terms (list): List of term dictionaries with 'original', 'replacement', 'caseSensitive', 'isRegex', 'wholeWord'.
 
     Returns:
-        str: The processed text with replacements applied.
+        list: Compiled term dictionaries.
 
     Raises:
-        SearchReplaceError: If an error occurs during replacement.
+        SearchReplaceError: If a pattern fails to compile.
     """
     try:
         # Categorize terms
@@ -168,68 +231,206 @@ def apply_search_replace(text, terms):
                     else:
                         pattern = escaped
                     patterns.append(pattern)
-                combined = '|'.join(patterns)
+                # Keys are bytes for terms from encode_search_replace_terms
+                separator = b'|' if isinstance(sorted_keys[0], bytes) else '|'
+                combined = separator.join(patterns)
                 pattern = re.compile(combined, flags)
-                compiled_terms.append({
+                compiled_term = {
                     'pattern': pattern,
                     'replacement_map': map_dict,
                     'is_simple': True,
                     'case_sensitive': case_sensitive
-                })
+                }
+                # Plain substrings need no regex features, so they can be matched
+                # with an Aho-Corasick automaton when pyahocorasick is installed
+                if ahocorasick is not None and case_sensitive and not whole_word and isinstance(sorted_keys[0], str) and all(sorted_keys):
+                    automaton = ahocorasick.Automaton()
+                    for k in sorted_keys:
+                        automaton.add_word(k, len(k))
+                    automaton.make_automaton()
+                    compiled_term['automaton'] = automaton
+                compiled_terms.append(compiled_term)
 
         add_simple_group(simple_cs_partial, 0, False, True)
         add_simple_group(simple_cs_whole, 0, True, True)
         add_simple_group(simple_ci_partial, re.IGNORECASE, False, False)
         add_simple_group(simple_ci_whole, re.IGNORECASE, True, False)
 
-        # Find all matches
-        replacements = []
-        for comp in compiled_terms:
-            pat = comp['pattern']
-            matches = list(pat.finditer(text))
-            for match in matches:
-                if match.start() == match.end():
-                    continue
-                matched_text = match.group(0)
-                if comp.get('is_simple'):
-                    key = matched_text if comp['case_sensitive'] else matched_text.lower()
-                    repl = comp['replacement_map'].get(key)
-                    if repl is not None:
-                        replacements.append({'start': match.start(), 'end': match.end(), 'replacement': repl})
-                else:
-                    # For variable-width lookbehind fixes, if it was converted to capturing groups, use group 2
-                    if 'original_fixed' in comp and comp['original_fixed'].startswith('(') and comp['original_fixed'].count('(') >= 2:
-                        if len(match.groups()) >= 2:
-                            matched_text = match.group(2)
-                            replacements.append({'start': match.start(2), 'end': match.end(2), 'replacement': comp['replacement']})
-                        else:
-                            replacements.append({'start': match.start(), 'end': match.end(), 'replacement': comp['replacement']})
-                    else:
-                        replacements.append({'start': match.start(), 'end': match.end(), 'replacement': comp['replacement']})
+        # When every term is a case-sensitive single-character substitution, a
+        # single str.translate pass gives the same result as matching
+        only_cs_partial = not (regex_terms or simple_cs_whole or simple_ci_partial or simple_ci_whole)
+        if simple_cs_partial and only_cs_partial and all(isinstance(k, str) and len(k) == 1 for k in simple_cs_partial):
+            return [{'translation': str.maketrans(simple_cs_partial)}]
+
+        # A single group of non-empty literals has no overlaps to resolve between
+        # patterns, so its leftmost-longest matches can be substituted in one pass.
+        # Case-insensitive keys qualify only when every match lowercases back to a
+        # key: non-ASCII keys and 'i', 'k', 's' also match letters that do not.
+        if len(compiled_terms) == 1 and compiled_terms[0].get('is_simple'):
+            keys = compiled_terms[0]['replacement_map']
+            if all(keys) and (compiled_terms[0]['case_sensitive'] or all(isinstance(k, bytes) or (k.isascii() and not any(c in k for c in 'iks')) for k in keys)):
+                compiled_terms[0]['single_pass'] = True
+
+        return compiled_terms
+
+    except Exception as e:
+        raise SearchReplaceError(f"Error compiling search-replace terms: {str(e)}")
+
+def compile_search_replace_prefilter(terms):
+    """
+    Builds a single pattern that matches wherever any simple term could match.
+
+    Text without a prefilter match cannot be changed by apply_search_replace, so
+    it can be skipped without running the full replacement. Regex terms can match
+    anything, so no prefilter is built when any are present.
+
+    Args:
+        terms (list): List of validated term dictionaries.
+
+    Returns:
+        re.Pattern or None: The prefilter pattern, or None if it cannot be used.
+    """
+    if not terms or any(term['isRegex'] for term in terms):
+        return None
+    # Same keys as the replacement groups, matched case-insensitively and
+    # without word boundaries, so this matches a superset of the replacements
+    keys = {term['original'] if term['caseSensitive'] else term['original'].lower() for term in terms}
+    separator = b'|' if any(isinstance(key, bytes) for key in keys) else '|'
+    return re.compile(separator.join(map(re.escape, keys)), re.IGNORECASE)
+
+def encode_search_replace_terms(terms):
+    """
+    Encodes terms to UTF-8 so they can be applied to raw UTF-8 content.
+
+    Matching on bytes gives the same replacements as matching the decoded text
+    only for plain literal terms: regex terms, whole-word matching (\\b is ASCII-only
+    on bytes) and case-insensitive matching of non-ASCII or Unicode-folding
+    letters ('i', 'k', 's') behave differently, so terms using them are not encoded.
+
+    Args:
+        terms (list): List of validated term dictionaries.
+
+    Returns:
+        list or None: Terms with bytes 'original' and 'replacement', or None if
+        the terms must be applied to decoded text.
+    """
+    encoded_terms = []
+    for term in terms:
+        orig = term['original']
+        if term['isRegex'] or term.get('wholeWord', False):
+            return None
+        if not term['caseSensitive'] and (not orig.isascii() or any(c in orig.lower() for c in 'iks')):
+            return None
+        encoded_term = dict(term)
+        encoded_term['original'] = orig.encode('utf-8')
+        encoded_term['replacement'] = term['replacement'].encode('utf-8')
+        encoded_terms.append(encoded_term)
+    return encoded_terms
+
+def _replacement_order(rep):
+    """Sort key for (start, end, replacement) tuples: start ascending, then longer matches first."""
+    return (rep[0], -rep[1])
+
+def _iter_replacements(comp, text):
+    """
+    Yields the replacements found by one compiled term, sorted by _replacement_order.
+
+    Args:
+        comp (dict): Compiled term from compile_search_replace_terms.
+        text (str or bytes): Text to search.
+
+    Yields:
+        tuple: (start, end, replacement)
+    """
+    if 'automaton' in comp and isinstance(text, str):
+        for start, end in _automaton_spans(comp['automaton'], text):
+            yield (start, end, comp['replacement_map'][text[start:end]])
+        return
+
+    pat = comp['pattern']
+    if comp.get('is_simple'):
+        # Non-overlapping matches of a single pattern already come in order
+        for match in pat.finditer(text):
+            if match.start() == match.end():
+                continue
+            matched_text = match.group(0)
+            key = matched_text if comp['case_sensitive'] else matched_text.lower()
+            repl = comp['replacement_map'].get(key)
+            if repl is not None:
+                yield (match.start(), match.end(), repl)
+        return
+
+    replacements = []
+    for match in pat.finditer(text):
+        if match.start() == match.end():
+            continue
+        # For variable-width lookbehind fixes, if it was converted to capturing groups, use group 2
+        if 'original_fixed' in comp and comp['original_fixed'].startswith('(') and comp['original_fixed'].count('(') >= 2:
+            # A pattern split into alternatives may have matched without group 2
+            if len(match.groups()) >= 2 and match.start(2) != -1:
+                replacements.append((match.start(2), match.end(2), comp['replacement']))
+            else:
+                replacements.append((match.start(), match.end(), comp['replacement']))
+        else:
+            replacements.append((match.start(), match.end(), comp['replacement']))
+    # Group 2 spans can be empty, so their order is not guaranteed
+    replacements.sort(key=_replacement_order)
+    yield from replacements
 
-        # Sort: start asc, then end desc
-        replacements.sort(key=lambda r: (r['start'], -r['end']))
+def apply_search_replace(text, terms, compiled_terms=None):
+    """
+    Applies search-replace terms to the given text using batched replacement to handle overlaps and prioritization.
+
+    Args:
+        text (str or bytes): The original text to process; bytes require terms from encode_search_replace_terms.
+        terms (list): List of term dictionaries with 'original', 'replacement', 'caseSensitive', 'isRegex', 'wholeWord'.
+        compiled_terms (list, optional): Result of compile_search_replace_terms(terms), to reuse across texts.
+
+    Returns:
+        str or bytes: The processed text with replacements applied.
+
+    Raises:
+        SearchReplaceError: If an error occurs during replacement.
+    """
+    if not terms:
+        return text
+    if compiled_terms is None:
+        compiled_terms = compile_search_replace_terms(terms)
+    try:
+        if compiled_terms and 'translation' in compiled_terms[0]:
+            return text.translate(compiled_terms[0]['translation'])
+        if compiled_terms and compiled_terms[0].get('single_pass'):
+            replacement_map = compiled_terms[0]['replacement_map']
+            if compiled_terms[0]['case_sensitive']:
+                return compiled_terms[0]['pattern'].sub(lambda match: replacement_map[match.group(0)], text)
+            return compiled_terms[0]['pattern'].sub(lambda match: replacement_map[match.group(0).lower()], text)
+
+        # Each compiled term yields its matches sorted by (start, -end); merging the
+        # streams avoids collecting and sorting every match at once
+        streams = [_iter_replacements(comp, text) for comp in compiled_terms]
+        merged = heapq.merge(*streams, key=_replacement_order)
 
         # Select non-overlapping
         winning = []
         last_end = -1
-        for rep in replacements:
-            if rep['start'] >= last_end:
+        for rep in merged:
+            if rep[0] >= last_end:
                 winning.append(rep)
-                last_end = rep['end']
-
-        # Sort by start desc
-        winning.sort(key=lambda r: r['start'], reverse=True)
-
-        # Apply
-        result = text
-        for rep in winning:
-            start = rep['start']
-            end = rep['end']
-            repl = rep['replacement']
-            result = result[:start] + repl + result[end:]
-
-        return result
+                last_end = rep[1]
+
+        if not winning:
+            return text
+
+        # Apply in one left-to-right pass; winning is already sorted by start
+        parts = []
+        cursor = 0
+        for start, end, repl in winning:
+            parts.append(text[cursor:start])
+            parts.append(repl)
+            cursor = end
+        parts.append(text[cursor:])
+        # text[:0] is '' or b'', matching the type of text
+        return text[:0].join(parts)
 
     except Exception as e:
         raise SearchReplaceError(f"Error applying search-replace: {str(e)}")
\ No newline at end of file
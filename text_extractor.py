@@ -1,67 +1,176 @@
 import logging
-import warnings
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+import os
+import json
+import collections
+import concurrent.futures
+import threading
+from lxml import etree, html
 import re
-from config_manager import get_setting
-from search_replace_processor import apply_search_replace
+from config_manager import get_setting, load_config
+from search_replace_processor import apply_search_replace, compile_search_replace_terms
 
-def extract_text_from_html(html_content):
+try:
+    # Local tokenizer; counts tokens without a network request per chapter
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# tiktoken encoding used for token counting; loaded on first use, False once loading failed
+_TIKTOKEN_ENCODING = 'cl100k_base'
+_token_encoding = None
+
+# Gemini model used for token counting, created on first use
+_token_model = None
+
+# Chapter content is decoded to str upstream and re-encoded as UTF-8 for lxml.
+# lxml parsers must not be shared between threads, so each thread gets its own
+_parser_local = threading.local()
+
+# Elements whose text must not end up in a paragraph; void elements like
+# <meta> and <link> carry no text, so they need no stripping
+_STRIP_TAGS = ('script', 'style')
+
+# Runs of two or more spaces, and line-break runs collapsed by remove_empty_lines
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_BLANK_LINES_RE = re.compile(r'\n\n+')
+
+# Extracted text of recently processed chapters, keyed on (chapter HTML, formatting
+# options, terms), so redoing an extraction skips parsing and replacement
+_CHAPTER_TEXT_CACHE = collections.OrderedDict()
+_CHAPTER_TEXT_CACHE_SIZE = 256
+
+# Title prefixes ignored when checking for duplicated chapter titles: an optional
+# 'Chapter', then an optional 'N:', then an optional 'N', each with trailing spaces
+_TITLE_PREFIX_RE = re.compile(r'^(?:Chapter\s*)?(?:\d+:\s*)?(?:\d+\s*)?', re.IGNORECASE)
+
+def normalize_whitespace(text, preserve_paragraph_breaks, remove_line_breaks, remove_empty_lines):
+    """
+    Normalizes whitespace in the text.
+
+    Runs of spaces and tabs collapse to one space. Line breaks become spaces
+    when remove_line_breaks is set; otherwise, with remove_empty_lines, runs of
+    line breaks collapse to one (or are dropped if paragraph breaks are not preserved).
+    Single-character rewrites use str.replace, which is cheaper than a regex
+    that has to test every lone space.
+
+    Args:
+        text (str): Text to normalize.
+        preserve_paragraph_breaks (bool): Whether paragraphs are newline-separated.
+        remove_line_breaks (bool): Replace line breaks with spaces.
+        remove_empty_lines (bool): Collapse consecutive line breaks.
+
+    Returns:
+        str: Normalized text.
+    """
+    text = text.replace('\t', ' ')
+    if remove_line_breaks:
+        return _MULTI_SPACE_RE.sub(' ', text.replace('\n', ' '))
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    if remove_empty_lines:
+        if preserve_paragraph_breaks:
+            text = _BLANK_LINES_RE.sub('\n', text)
+        else:
+            # Dropping every run of line breaks is dropping every line break
+            text = text.replace('\n', '')
+    return text
+
+def _get_html_parser():
+    """
+    Returns the calling thread's lxml HTML parser, creating it on first use.
+
+    Returns:
+        lxml.html.HTMLParser: Parser for UTF-8 encoded HTML.
+    """
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = html.HTMLParser(encoding='utf-8')
+    return parser
+
+def extract_text_from_html(html_content, preserve_paragraph_breaks=None, remove_line_breaks=None, remove_empty_lines=None):
     """
     Extracts clean text from HTML content.
 
+    Formatting options that are not given are read from the config.
+
     Args:
         html_content (str): Raw HTML content.
+        preserve_paragraph_breaks (bool, optional): Separate paragraphs with newlines.
+        remove_line_breaks (bool, optional): Replace line breaks with spaces.
+        remove_empty_lines (bool, optional): Collapse consecutive line breaks.
 
     Returns:
         str: Cleaned text.
     """
-    warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
-    soup = BeautifulSoup(html_content, 'lxml')
+    root = etree.fromstring(html_content.encode('utf-8'), _get_html_parser())
+    if root is None:
+        return ""
 
-    # Remove script, style, and other unwanted tags
-    for tag in soup(["script", "style", "meta", "link"]):
-        tag.extract()
+    # Remove script and style elements
+    etree.strip_elements(root, *_STRIP_TAGS, with_tail=False)
 
-    # Extract text from paragraphs
-    paragraphs = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
-    separator = '\n' if get_setting('preserve_paragraph_breaks') else ' '
+    # Extract text from paragraphs; text_content() gathers each one's text in C
+    paragraphs = [text for p in root.iter('p') if (text := p.text_content().strip())]
+    if preserve_paragraph_breaks is None:
+        preserve_paragraph_breaks = get_setting('preserve_paragraph_breaks')
+    if remove_line_breaks is None:
+        remove_line_breaks = get_setting('remove_line_breaks')
+    if remove_empty_lines is None:
+        remove_empty_lines = get_setting('remove_empty_lines')
+    separator = '\n' if preserve_paragraph_breaks else ' '
     text = separator.join(paragraphs)
 
-    # Normalize spaces
-    text = re.sub(r'[ \t]+', ' ', text)
-
-    # Handle line break removal based on config
-    if get_setting('remove_line_breaks'):
-        text = text.replace('\n', ' ')
-        text = re.sub(r' +', ' ', text)
+    # Normalize spaces, line breaks and empty lines based on config
+    text = normalize_whitespace(text, preserve_paragraph_breaks, remove_line_breaks, remove_empty_lines)
+    if remove_line_breaks:
         logging.debug("Removed line breaks from extracted text")
-
-    # Handle empty line removal
-    if get_setting('remove_empty_lines'):
-        if get_setting('preserve_paragraph_breaks'):
-            text = re.sub(r'\n+', '\n', text)
-        else:
-            text = re.sub(r'\n+', '', text)
+    if remove_empty_lines:
         logging.debug("Removed consecutive empty lines from extracted text")
 
     return text.strip()
 
-def count_words(text):
+def _get_token_encoding():
+    """
+    Loads the tiktoken encoding once. Loading may download the encoding file,
+    so a failure is remembered rather than retried for every chapter.
+
+    Returns:
+        tiktoken.Encoding or None: The encoding, or None if unavailable.
+    """
+    global _token_encoding
+    if _token_encoding is None:
+        try:
+            _token_encoding = tiktoken.get_encoding(_TIKTOKEN_ENCODING)
+        except Exception as e:
+            logging.warning(f"Failed to load tiktoken encoding: {e}, falling back to Google Generative AI")
+            _token_encoding = False
+    return _token_encoding or None
+
+def count_words(text, mode=None):
     """
     Counts the number of words or tokens in the text based on counting_mode setting.
 
+    Tokens are counted locally with tiktoken when it is installed, otherwise
+    with the Gemini API, whose model object is created once and reused.
+
     Args:
         text (str): Text to count in.
+        mode (str, optional): 'words' or 'tokens'; read from the config if not given.
 
     Returns:
         int: Count of words or tokens.
     """
-    mode = get_setting('counting_mode')
+    if mode is None:
+        mode = get_setting('counting_mode')
     if mode == 'tokens':
+        encoding = _get_token_encoding() if tiktoken is not None else None
+        if encoding is not None:
+            return len(encoding.encode_ordinary(text))
         try:
             import google.generativeai as genai
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            result = model.count_tokens(text)
+            global _token_model
+            if _token_model is None:
+                _token_model = genai.GenerativeModel('gemini-2.5-flash')
+            result = _token_model.count_tokens(text)
             return result.total_tokens
         except ImportError:
             logging.warning("google-generativeai not installed, falling back to word counting")
@@ -83,13 +192,96 @@ def normalize_title_for_dedup(text):
     Returns:
         str: Normalized title text.
     """
-    text = text.strip()
-    text = re.sub(r'^Chapter\s*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'^\d+:\s*', '', text)
-    text = re.sub(r'^\d+\s*', '', text)
-    return text.strip()
+    return _TITLE_PREFIX_RE.sub('', text.strip(), count=1).strip()
+
+def _get_cached_chapter_text(key):
+    """
+    Looks up a chapter's extracted text in the cache.
+
+    Args:
+        key (tuple): (chapter_html, extract_options, terms_key).
+
+    Returns:
+        str or None: The cached text, or None if not cached.
+    """
+    chapter_text = _CHAPTER_TEXT_CACHE.get(key)
+    if chapter_text is not None:
+        _CHAPTER_TEXT_CACHE.move_to_end(key)
+    return chapter_text
+
+def _cache_chapter_text(key, chapter_text):
+    """
+    Stores a chapter's extracted text, evicting the least recently used entry when full.
+
+    Args:
+        key (tuple): (chapter_html, extract_options, terms_key).
+        chapter_text (str): Extracted chapter text.
+    """
+    _CHAPTER_TEXT_CACHE[key] = chapter_text
+    if len(_CHAPTER_TEXT_CACHE) > _CHAPTER_TEXT_CACHE_SIZE:
+        _CHAPTER_TEXT_CACHE.popitem(last=False)
+
+def _iter_chapter_texts(epub_processor, start_chapter, extract_options, settings, terms=None, compiled_terms=None):
+    """
+    Yields the extracted, search-replaced text of consecutive chapters, in order.
+
+    With parallel processing enabled, the next few chapters are parsed ahead on
+    a thread pool (lxml releases the GIL while parsing); chapters still pending
+    when the caller stops are cancelled. Search-replace runs as each chapter is
+    consumed, in order. Chapters extracted recently with the same options and
+    terms are taken from the cache.
+
+    Args:
+        epub_processor (EpubProcessor): Instance of EpubProcessor.
+        start_chapter (int): Starting chapter number (1-based).
+        extract_options (tuple): Formatting options passed to extract_text_from_html.
+        settings (dict): Settings snapshot holding the parallel processing options.
+        terms (list, optional): List of search-replace term dictionaries.
+        compiled_terms (list, optional): Result of compile_search_replace_terms(terms).
+
+    Yields:
+        tuple: (chapter_num, chapter_text)
+    """
+    last_chapter = epub_processor.get_total_chapters()
+    terms_key = json.dumps(terms, sort_keys=True) if terms else None
+
+    def finish(key, chapter_text):
+        if terms:
+            chapter_text = apply_search_replace(chapter_text, terms, compiled_terms)
+        _cache_chapter_text(key, chapter_text)
+        return chapter_text
+
+    if not settings.get('enable_parallel_processing'):
+        for chapter_num in range(start_chapter, last_chapter + 1):
+            key = (epub_processor.get_chapter_content(chapter_num), extract_options, terms_key)
+            chapter_text = _get_cached_chapter_text(key)
+            if chapter_text is None:
+                chapter_text = finish(key, extract_text_from_html(key[0], *extract_options))
+            yield chapter_num, chapter_text
+        return
 
-def extract_chapters_text(epub_processor, start_chapter, max_count, terms=None):
+    max_workers = settings.get('max_workers') or min(8, os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        next_chapter = start_chapter
+        try:
+            for chapter_num in range(start_chapter, last_chapter + 1):
+                # Keep up to max_workers chapters parsing ahead of the one being consumed
+                while next_chapter <= last_chapter and len(pending) <= max_workers:
+                    key = (epub_processor.get_chapter_content(next_chapter), extract_options, terms_key)
+                    chapter_text = _get_cached_chapter_text(key)
+                    pending.append((key, chapter_text if chapter_text is not None else executor.submit(extract_text_from_html, key[0], *extract_options)))
+                    next_chapter += 1
+                key, chapter_text = pending.popleft()
+                if isinstance(chapter_text, concurrent.futures.Future):
+                    chapter_text = finish(key, chapter_text.result())
+                yield chapter_num, chapter_text
+        finally:
+            for _, chapter_text in pending:
+                if isinstance(chapter_text, concurrent.futures.Future):
+                    chapter_text.cancel()
+
+def extract_chapters_text(epub_processor, start_chapter, max_count, terms=None, compiled_terms=None):
     """
     Extracts text from consecutive chapters starting from the given chapter,
     up to the maximum count. Applies search-replace terms to each chapter if provided.
@@ -99,55 +291,72 @@ def extract_chapters_text(epub_processor, start_chapter, max_count, terms=None):
         start_chapter (int): Starting chapter number (1-based).
         max_count (int): Maximum count (words or tokens based on mode).
         terms (list, optional): List of search-replace term dictionaries.
+        compiled_terms (list, optional): Result of compile_search_replace_terms(terms),
+            for callers extracting repeatedly with the same terms.
 
     Returns:
         tuple: (extracted_text, included_chapters, total_count)
     """
-    count_type = "tokens" if get_setting('counting_mode') == 'tokens' else "words"
+    # Snapshot the settings once for the whole run; each get_setting call
+    # would re-check the config file
+    settings = load_config()['settings']
+    counting_mode = settings.get('counting_mode')
+    include_chapter_titles = settings.get('include_chapter_titles')
+    fix_title_duplication = settings.get('fix_title_duplication')
+    preserve_paragraph_breaks = settings.get('preserve_paragraph_breaks')
+    remove_line_breaks = settings.get('remove_line_breaks')
+    remove_empty_lines = settings.get('remove_empty_lines')
+    count_type = "tokens" if counting_mode == 'tokens' else "words"
     logging.info(f"Starting text extraction from chapter {epub_processor.get_real_chapter_number(start_chapter - 1)} with max {count_type} {max_count}")
-    text = ""
-    current_chapter = start_chapter
+    # Chapter and title pieces, joined once at the end
+    parts = []
     total_count = 0
     included_chapters = []
+    # Compile the terms once for all chapters, unless the caller already has
+    if terms and compiled_terms is None:
+        compiled_terms = compile_search_replace_terms(terms)
+    chapter_texts = _iter_chapter_texts(epub_processor, start_chapter, (preserve_paragraph_breaks, remove_line_breaks, remove_empty_lines), settings, terms, compiled_terms)
 
-    while total_count < max_count and current_chapter <= epub_processor.get_total_chapters():
-        chapter_html = epub_processor.get_chapter_content(current_chapter)
-        chapter_text = extract_text_from_html(chapter_html)
-        if terms:
-            chapter_text = apply_search_replace(chapter_text, terms)
-        chapter_count = count_words(chapter_text)
-        logging.debug(f"Processing chapter {current_chapter}, {count_type} in chapter: {chapter_count}")
+    # Per-chapter messages use lazy %-formatting, so nothing is formatted when they are filtered out
+    while total_count < max_count:
+        next_chapter = next(chapter_texts, None)
+        if next_chapter is None:
+            break
+        current_chapter, chapter_text = next_chapter
+        chapter_count = count_words(chapter_text, counting_mode)
+        logging.debug("Processing chapter %d, %s in chapter: %d", current_chapter, count_type, chapter_count)
 
         if total_count + chapter_count > max_count:
             # Don't include partial chapters
-            logging.debug(f"Chapter {current_chapter} would exceed max {count_type}, stopping extraction")
+            logging.debug("Chapter %d would exceed max %s, stopping extraction", current_chapter, count_type)
             break
 
-        if get_setting('include_chapter_titles'):
+        if include_chapter_titles:
             chapter_title = epub_processor.get_chapter_title(current_chapter)
             if terms:
-                chapter_title = apply_search_replace(chapter_title, terms)
+                chapter_title = apply_search_replace(chapter_title, terms, compiled_terms)
             # Check for title duplication if enabled
-            if get_setting('fix_title_duplication'):
+            if fix_title_duplication:
                 normalized_title = normalize_title_for_dedup(chapter_title)
                 if normalized_title:
                     prefix_length = min(len(chapter_text), len(chapter_title) * 3 + 20)
                     normalized_text_start = normalize_title_for_dedup(chapter_text[:prefix_length])
                     if normalized_title.lower() in normalized_text_start.lower():
-                        logging.debug(f"Skipped adding duplicate title '{chapter_title}' for chapter {current_chapter}")
+                        logging.debug("Skipped adding duplicate title '%s' for chapter %d", chapter_title, current_chapter)
                     else:
-                        text += f"\n\n{chapter_title}\n\n"
+                        parts.append(f"\n\n{chapter_title}\n\n")
                 else:
-                    text += f"\n\n{chapter_title}\n\n"
+                    parts.append(f"\n\n{chapter_title}\n\n")
             else:
-                text += f"\n\n{chapter_title}\n\n"
+                parts.append(f"\n\n{chapter_title}\n\n")
 
-        text += chapter_text + "\n\n"
+        parts.append(chapter_text)
+        parts.append("\n\n")
         total_count += chapter_count
         real_num = epub_processor.get_real_chapter_number(current_chapter - 1)
         included_chapters.append(real_num if real_num is not None else current_chapter)
-        logging.info(f"Included chapter {real_num} with {chapter_count} {count_type}")
-        current_chapter += 1
+        logging.info("Included chapter %s with %d %s", real_num, chapter_count, count_type)
 
+    chapter_texts.close()
     logging.info(f"Extraction complete: included {len(included_chapters)} chapters, total {count_type}: {total_count}")
-    return text.strip(), included_chapters, total_count
\ No newline at end of file
+    return "".join(parts).strip(), included_chapters, total_count
\ No newline at end of file
@@ -1,14 +1,72 @@
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
-from tkinter import filedialog
-from tkinter import Tk
+from rich.text import Text
 import os
+import atexit
+import functools
 from config_manager import get_setting, set_setting, load_config
 
 console = Console()
 
+# Hidden Tk root shared by the file pickers, created on first use
+_tk_root = None
+
+# Performance settings shown in their own table: key -> (label, value formatter)
+_PERFORMANCE_SETTINGS = {
+    'enable_parallel_processing': ("Parallel Processing", lambda value: "Enabled" if value else "Disabled"),
+    'max_workers': ("Max Workers", str),
+    'enable_content_filtering': ("Content Filtering", lambda value: "Enabled" if value else "Disabled"),
+    'min_word_count_threshold': ("Min Word Count Threshold", str),
+    'exclusion_keywords': ("Exclusion Keywords", lambda value: ', '.join(value) if isinstance(value, list) else str(value)),
+}
+
+# Internal/directory settings left out of the general settings table
+_HIDDEN_SETTINGS = frozenset(['last_extraction_params', 'last_epub_directory', 'last_json_directory'])
+
+# Status messages printed after most settings changes, styled once instead of parsed as markup
+_SETTING_UPDATED = Text("Setting updated!", style="green")
+_INVALID_NUMBER = Text("Invalid value! Must be a number.", style="red")
+_INVALID_VALUE = Text("Invalid value!", style="red")
+_KEYWORD_ADDED = Text("Keyword added!", style="green")
+_KEYWORD_EXISTS = Text("Keyword already exists or is empty.", style="yellow")
+_KEYWORD_REMOVED = Text("Keyword removed!", style="green")
+_NO_KEYWORDS_TO_REMOVE = Text("No keywords to remove.", style="yellow")
+_KEYWORDS_REPLACED = Text("Keywords replaced!", style="green")
+_NO_VALID_KEYWORDS = Text("No valid keywords entered.", style="yellow")
+
+# The main menu never changes, so its markup is parsed once
+_MAIN_MENU_PANEL = Panel.fit(
+    Text.from_markup(
+        "[bold blue]ChapterClip - EPUB Text Extractor[/bold blue]\n\n"
+        "Please select an option:\n\n"
+        "[1] Extract chapters from EPUB\n"
+        "[2] Replace Epub Terms\n"
+        "[3] Configure settings\n"
+        "[4] View current settings\n"
+        "[5] Exit\n"
+    ),
+    title="Main Menu"
+)
+
+def _get_tk_root():
+    """
+    Returns the hidden Tk root used as the file dialogs' parent, creating it once
+    and destroying it at exit. tkinter is imported here so the menus never pay
+    for loading Tcl/Tk.
+
+    Returns:
+        tkinter.Tk: The withdrawn root window.
+    """
+    global _tk_root
+    if _tk_root is None:
+        from tkinter import Tk
+        _tk_root = Tk()
+        _tk_root.withdraw()  # Hide the main window
+        atexit.register(_tk_root.destroy)
+    return _tk_root
+
 def select_epub_file():
     """
     Opens a file dialog to select an EPUB file.
@@ -17,15 +75,16 @@ def select_epub_file():
         str: Path to the selected EPUB file, or None if cancelled.
     """
     try:
-        root = Tk()
-        root.withdraw()  # Hide the main window
+        from tkinter import filedialog
+        root = _get_tk_root()
         initial_dir = get_setting('last_epub_directory') or os.getcwd()
         file_path = filedialog.askopenfilename(
+            parent=root,
             title="Select EPUB file",
             filetypes=[("EPUB files", "*.epub")],
             initialdir=initial_dir
         )
-        root.destroy()
+        root.update()  # Let the closed dialog disappear
         if file_path:
             set_setting('last_epub_directory', os.path.dirname(file_path))
         return file_path
@@ -42,15 +101,16 @@ def select_json_file():
         str: Path to the selected JSON file, or None if cancelled.
     """
     try:
-        root = Tk()
-        root.withdraw()  # Hide the main window
+        from tkinter import filedialog
+        root = _get_tk_root()
         initial_dir = get_setting('last_json_directory') or os.getcwd()
         file_path = filedialog.askopenfilename(
+            parent=root,
             title="Select JSON file",
             filetypes=[("JSON files", "*.json")],
             initialdir=initial_dir
         )
-        root.destroy()
+        root.update()  # Let the closed dialog disappear
         if file_path:
             set_setting('last_json_directory', os.path.dirname(file_path))
         return file_path
@@ -64,17 +124,7 @@ def display_main_menu():
     Displays the main menu.
     """
     console.clear()
-    panel = Panel.fit(
-        "[bold blue]ChapterClip - EPUB Text Extractor[/bold blue]\n\n"
-        "Please select an option:\n\n"
-        "[1] Extract chapters from EPUB\n"
-        "[2] Replace Epub Terms\n"
-        "[3] Configure settings\n"
-        "[4] View current settings\n"
-        "[5] Exit\n",
-        title="Main Menu"
-    )
-    console.print(panel)
+    console.print(_MAIN_MENU_PANEL)
 
 def get_user_choice(options):
     """
@@ -113,14 +163,15 @@ def display_extraction_result(included_chapters, total_count, max_count):
         total_count (int): Total count extracted (words or tokens).
         max_count (int): Maximum allowed count.
     """
-    from config_manager import get_setting
     count_type = "tokens" if get_setting('counting_mode') == 'tokens' else "words"
-    console.print("\n[bold green]Extraction Complete![/bold green]")
-    console.print("✓ Successfully extracted and copied to clipboard\n")
-    console.print("\nDetails:")
-    console.print(f"  • Chapters included: {included_chapters[0]}-{included_chapters[-1]} ({len(included_chapters)} chapters)")
-    console.print(f"  • Total {count_type}: {total_count}")
-    console.print(f"  • Maximum allowed: {max_count}")
+    console.print(
+        "\n[bold green]Extraction Complete![/bold green]\n"
+        "✓ Successfully extracted and copied to clipboard\n\n"
+        "\nDetails:\n"
+        f"  • Chapters included: {included_chapters[0]}-{included_chapters[-1]} ({len(included_chapters)} chapters)\n"
+        f"  • Total {count_type}: {total_count}\n"
+        f"  • Maximum allowed: {max_count}"
+    )
 
 def display_post_extraction_menu():
     """
@@ -129,10 +180,12 @@ def display_post_extraction_menu():
     Returns:
         int: User's choice (1, 2, or 3).
     """
-    console.print("\nWhat would you like to do next?\n")
-    console.print("[1] Recopy the extracted text to clipboard again")
-    console.print("[2] Redo extraction with previous settings")
-    console.print("[3] Return to the main menu")
+    console.print(
+        "\nWhat would you like to do next?\n\n"
+        "[1] Recopy the extracted text to clipboard again\n"
+        "[2] Redo extraction with previous settings\n"
+        "[3] Return to the main menu"
+    )
     choice = get_user_choice([1, 2, 3])
     return choice
 def display_replacement_result(processed_items, output_path):
@@ -143,11 +196,13 @@ def display_replacement_result(processed_items, output_path):
         processed_items (int): Number of items processed.
         output_path (str): Path to the output EPUB file.
     """
-    console.print("\n[bold green]Term Replacement Complete![/bold green]")
-    console.print("✓ Successfully processed EPUB with term replacements\n")
-    console.print("\nDetails:")
-    console.print(f"  • HTML items processed: {processed_items}")
-    console.print(f"  • Output file: {output_path}")
+    console.print(
+        "\n[bold green]Term Replacement Complete![/bold green]\n"
+        "✓ Successfully processed EPUB with term replacements\n\n"
+        "\nDetails:\n"
+        f"  • HTML items processed: {processed_items}\n"
+        f"  • Output file: {output_path}"
+    )
 
 def display_replacement_confirmation(terms_count, epub_path):
     """
@@ -160,9 +215,7 @@ def display_replacement_confirmation(terms_count, epub_path):
     Returns:
         bool: True if confirmed.
     """
-    from rich.prompt import Confirm
-    console.print(f"\n[bold]Ready to process EPUB:[/bold] {epub_path}")
-    console.print(f"[bold]Terms loaded:[/bold] {terms_count}")
+    console.print(f"\n[bold]Ready to process EPUB:[/bold] {epub_path}\n[bold]Terms loaded:[/bold] {terms_count}")
     confirmed = Confirm.ask("Proceed with term replacement?")
     return confirmed
 
@@ -172,9 +225,6 @@ def display_settings():
     """
     settings = load_config()['settings']
 
-    # Performance settings keys
-    performance_keys = ['enable_parallel_processing', 'max_workers', 'enable_content_filtering', 'min_word_count_threshold', 'exclusion_keywords']
-
     # General settings table
     general_table = Table(title="General Settings")
     general_table.add_column("Setting", style="cyan")
@@ -186,166 +236,168 @@ def display_settings():
     performance_table.add_column("Value", style="magenta")
 
     for key, value in settings.items():
-        if key in performance_keys:
+        performance_setting = _PERFORMANCE_SETTINGS.get(key)
+        if performance_setting is not None:
             # Format performance settings with clear labels
-            if key == 'enable_parallel_processing':
-                display_value = "Enabled" if value else "Disabled"
-                label = "Parallel Processing"
-            elif key == 'max_workers':
-                display_value = str(value)
-                label = "Max Workers"
-            elif key == 'enable_content_filtering':
-                display_value = "Enabled" if value else "Disabled"
-                label = "Content Filtering"
-            elif key == 'min_word_count_threshold':
-                display_value = str(value)
-                label = "Min Word Count Threshold"
-            elif key == 'exclusion_keywords':
-                display_value = ', '.join(value) if isinstance(value, list) else str(value)
-                label = "Exclusion Keywords"
-            else:
-                label = key.replace('_', ' ').title()
-                display_value = str(value)
-            performance_table.add_row(label, display_value)
-        elif key not in ['last_extraction_params', 'last_epub_directory', 'last_json_directory']:
-            # Exclude internal/directory settings from general table
+            label, format_value = performance_setting
+            performance_table.add_row(label, format_value(value))
+        elif key not in _HIDDEN_SETTINGS:
             general_table.add_row(key.replace('_', ' ').title(), str(value))
 
-    console.print(general_table)
-    console.print()  # Add space between tables
-    console.print(performance_table)
+    # Render both tables, with a blank line between them, in one print
+    console.print(Group(general_table, "", performance_table))
+
+def _configure_max_count(settings):
+    """
+    Prompts for the maximum word or token count of the current counting mode.
+
+    Args:
+        settings (dict): Current settings.
+    """
+    counting_mode = settings.get('counting_mode')
+    key = 'max_tokens' if counting_mode == 'tokens' else 'max_words'
+    current = settings.get(key)
+    count_type = 'tokens' if counting_mode == 'tokens' else 'words'
+    new_value = Prompt.ask(f"Enter new max {count_type} (current: {current})", default=str(current))
+    try:
+        new_value = int(new_value)
+        set_setting(key, new_value)
+        console.print(_SETTING_UPDATED)
+    except ValueError:
+        console.print(_INVALID_VALUE)
+
+def _configure_bool(settings, key, question):
+    """
+    Asks a yes/no question and stores the answer as a boolean setting.
+
+    Args:
+        settings (dict): Current settings.
+        key (str): Setting key.
+        question (str): Question shown to the user.
+    """
+    current = settings.get(key)
+    new_value = Confirm.ask(f"{question} (current: {current})", default=current)
+    set_setting(key, new_value)
+    console.print(_SETTING_UPDATED)
+
+def _configure_choice(settings, key, question, choices):
+    """
+    Prompts for one of a fixed set of values for a setting.
+
+    Args:
+        settings (dict): Current settings.
+        key (str): Setting key.
+        question (str): Prompt shown to the user.
+        choices (list): Allowed values.
+    """
+    current = settings.get(key)
+    new_value = Prompt.ask(f"{question} (current: {current})", choices=choices, default=current)
+    set_setting(key, new_value)
+    console.print(_SETTING_UPDATED)
+
+def _configure_int(settings, key, question, minimum, minimum_error):
+    """
+    Prompts for an integer setting that must be at least a minimum value.
+
+    Args:
+        settings (dict): Current settings.
+        key (str): Setting key.
+        question (str): Prompt shown to the user.
+        minimum (int): Smallest allowed value.
+        minimum_error (str): Message shown for values below the minimum.
+    """
+    current = settings.get(key)
+    new_value = Prompt.ask(f"{question} (current: {current})", default=str(current))
+    try:
+        new_value = int(new_value)
+        if new_value >= minimum:
+            set_setting(key, new_value)
+            console.print(_SETTING_UPDATED)
+        else:
+            console.print(f"[red]{minimum_error}[/red]")
+    except ValueError:
+        console.print(_INVALID_NUMBER)
+
+def _configure_exclusion_keywords(settings):
+    """
+    Adds, removes or replaces content filtering exclusion keywords.
+
+    Args:
+        settings (dict): Current settings.
+    """
+    current_keywords = settings.get('exclusion_keywords')
+    console.print(f"Current exclusion keywords: {', '.join(current_keywords)}")
+    action = Prompt.ask("Choose action", choices=['add', 'remove', 'replace'], default='add')
+    if action == 'add':
+        new_keyword = Prompt.ask("Enter keyword to add")
+        if new_keyword and new_keyword not in current_keywords:
+            current_keywords.append(new_keyword)
+            set_setting('exclusion_keywords', current_keywords)
+            console.print(_KEYWORD_ADDED)
+        else:
+            console.print(_KEYWORD_EXISTS)
+    elif action == 'remove':
+        if current_keywords:
+            remove_keyword = Prompt.ask("Enter keyword to remove", choices=current_keywords)
+            current_keywords.remove(remove_keyword)
+            set_setting('exclusion_keywords', current_keywords)
+            console.print(_KEYWORD_REMOVED)
+        else:
+            console.print(_NO_KEYWORDS_TO_REMOVE)
+    elif action == 'replace':
+        console.print("Enter new keywords separated by commas:")
+        new_keywords_input = Prompt.ask("New keywords")
+        # Drop repeated keywords, keeping the order they were entered in
+        new_keywords = list(dict.fromkeys(kw.strip() for kw in new_keywords_input.split(',') if kw.strip()))
+        if new_keywords:
+            set_setting('exclusion_keywords', new_keywords)
+            console.print(_KEYWORDS_REPLACED)
+        else:
+            console.print(_NO_VALID_KEYWORDS)
+
+# configure_settings menu choices and the handlers that apply them
+_SETTING_HANDLERS = {
+    1: _configure_max_count,
+    2: functools.partial(_configure_bool, key='include_chapter_titles', question="Include chapter titles?"),
+    3: functools.partial(_configure_bool, key='preserve_paragraph_breaks', question="Preserve paragraph breaks?"),
+    4: functools.partial(_configure_choice, key='log_level', question="Select log level", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR']),
+    5: functools.partial(_configure_bool, key='remove_line_breaks', question="Remove line breaks?"),
+    6: functools.partial(_configure_bool, key='remove_empty_lines', question="Remove empty lines?"),
+    7: functools.partial(_configure_bool, key='fix_title_duplication', question="Fix title duplication?"),
+    8: functools.partial(_configure_choice, key='counting_mode', question="Select counting mode", choices=['words', 'tokens']),
+    9: functools.partial(_configure_bool, key='enable_parallel_processing', question="Enable parallel processing?"),
+    10: functools.partial(_configure_int, key='max_workers', question="Enter max workers", minimum=1, minimum_error="Max workers must be greater than 0!"),
+    11: functools.partial(_configure_bool, key='enable_content_filtering', question="Enable content filtering?"),
+    12: functools.partial(_configure_int, key='min_word_count_threshold', question="Enter min word count threshold", minimum=0, minimum_error="Min word count threshold must be 0 or greater!"),
+    13: _configure_exclusion_keywords,
+}
 
 def configure_settings():
     """
     Allows user to configure settings.
     """
-    counting_mode = get_setting('counting_mode')
+    # Read every setting the menu may show from one config snapshot
+    settings = load_config()['settings']
+    counting_mode = settings.get('counting_mode')
     label = "Max tokens" if counting_mode == 'tokens' else "Max words"
-    console.print("\n[bold]Configure Settings[/bold]")
-    console.print(f"1. {label}")
-    console.print("2. Include chapter titles")
-    console.print("3. Preserve paragraph breaks")
-    console.print("4. Log level")
-    console.print("5. Remove line breaks")
-    console.print("6. Remove empty lines")
-    console.print("7. Fix title duplication")
-    console.print("8. Counting mode")
-    console.print("9. Enable parallel processing")
-    console.print("10. Max workers")
-    console.print("11. Enable content filtering")
-    console.print("12. Min word count threshold")
-    console.print("13. Manage exclusion keywords")
-    choice = get_user_choice([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13])
-
-    if choice == 1:
-        key = 'max_tokens' if counting_mode == 'tokens' else 'max_words'
-        current = get_setting(key)
-        count_type = 'tokens' if counting_mode == 'tokens' else 'words'
-        new_value = Prompt.ask(f"Enter new max {count_type} (current: {current})", default=str(current))
-        try:
-            new_value = int(new_value)
-            set_setting(key, new_value)
-            console.print("[green]Setting updated![/green]")
-        except ValueError:
-            console.print("[red]Invalid value![/red]")
-    elif choice == 2:
-        current = get_setting('include_chapter_titles')
-        new_value = Confirm.ask(f"Include chapter titles? (current: {current})", default=current)
-        set_setting('include_chapter_titles', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 3:
-        current = get_setting('preserve_paragraph_breaks')
-        new_value = Confirm.ask(f"Preserve paragraph breaks? (current: {current})", default=current)
-        set_setting('preserve_paragraph_breaks', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 4:
-        current = get_setting('log_level')
-        new_value = Prompt.ask(f"Select log level (current: {current})", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default=current)
-        set_setting('log_level', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 5:
-        current = get_setting('remove_line_breaks')
-        new_value = Confirm.ask(f"Remove line breaks? (current: {current})", default=current)
-        set_setting('remove_line_breaks', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 6:
-        current = get_setting('remove_empty_lines')
-        new_value = Confirm.ask(f"Remove empty lines? (current: {current})", default=current)
-        set_setting('remove_empty_lines', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 7:
-        current = get_setting('fix_title_duplication')
-        new_value = Confirm.ask(f"Fix title duplication? (current: {current})", default=current)
-        set_setting('fix_title_duplication', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 8:
-        current = get_setting('counting_mode')
-        new_value = Prompt.ask(f"Select counting mode (current: {current})", choices=['words', 'tokens'], default=current)
-        set_setting('counting_mode', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 9:
-        current = get_setting('enable_parallel_processing')
-        new_value = Confirm.ask(f"Enable parallel processing? (current: {current})", default=current)
-        set_setting('enable_parallel_processing', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 10:
-        current = get_setting('max_workers')
-        new_value = Prompt.ask(f"Enter max workers (current: {current})", default=str(current))
-        try:
-            new_value = int(new_value)
-            if new_value > 0:
-                set_setting('max_workers', new_value)
-                console.print("[green]Setting updated![/green]")
-            else:
-                console.print("[red]Max workers must be greater than 0![/red]")
-        except ValueError:
-            console.print("[red]Invalid value! Must be a number.[/red]")
-    elif choice == 11:
-        current = get_setting('enable_content_filtering')
-        new_value = Confirm.ask(f"Enable content filtering? (current: {current})", default=current)
-        set_setting('enable_content_filtering', new_value)
-        console.print("[green]Setting updated![/green]")
-    elif choice == 12:
-        current = get_setting('min_word_count_threshold')
-        new_value = Prompt.ask(f"Enter min word count threshold (current: {current})", default=str(current))
-        try:
-            new_value = int(new_value)
-            if new_value >= 0:
-                set_setting('min_word_count_threshold', new_value)
-                console.print("[green]Setting updated![/green]")
-            else:
-                console.print("[red]Min word count threshold must be 0 or greater![/red]")
-        except ValueError:
-            console.print("[red]Invalid value! Must be a number.[/red]")
-    elif choice == 13:
-        current_keywords = get_setting('exclusion_keywords')
-        console.print(f"Current exclusion keywords: {', '.join(current_keywords)}")
-        action = Prompt.ask("Choose action", choices=['add', 'remove', 'replace'], default='add')
-        if action == 'add':
-            new_keyword = Prompt.ask("Enter keyword to add")
-            if new_keyword and new_keyword not in current_keywords:
-                current_keywords.append(new_keyword)
-                set_setting('exclusion_keywords', current_keywords)
-                console.print("[green]Keyword added![/green]")
-            else:
-                console.print("[yellow]Keyword already exists or is empty.[/yellow]")
-        elif action == 'remove':
-            if current_keywords:
-                remove_keyword = Prompt.ask("Enter keyword to remove", choices=current_keywords)
-                current_keywords.remove(remove_keyword)
-                set_setting('exclusion_keywords', current_keywords)
-                console.print("[green]Keyword removed![/green]")
-            else:
-                console.print("[yellow]No keywords to remove.[/yellow]")
-        elif action == 'replace':
-            console.print("Enter new keywords separated by commas:")
-            new_keywords_input = Prompt.ask("New keywords")
-            new_keywords = [kw.strip() for kw in new_keywords_input.split(',') if kw.strip()]
-            if new_keywords:
-                set_setting('exclusion_keywords', new_keywords)
-                console.print("[green]Keywords replaced![/green]")
-            else:
-                console.print("[yellow]No valid keywords entered.[/yellow]")
+    console.print(
+        "\n[bold]Configure Settings[/bold]\n"
+        f"1. {label}\n"
+        "2. Include chapter titles\n"
+        "3. Preserve paragraph breaks\n"
+        "4. Log level\n"
+        "5. Remove line breaks\n"
+        "6. Remove empty lines\n"
+        "7. Fix title duplication\n"
+        "8. Counting mode\n"
+        "9. Enable parallel processing\n"
+        "10. Max workers\n"
+        "11. Enable content filtering\n"
+        "12. Min word count threshold\n"
+        "13. Manage exclusion keywords"
+    )
+    choice = get_user_choice(list(_SETTING_HANDLERS))
+    _SETTING_HANDLERS[choice](settings)
 
     console.print("Press Enter to continue...")
     input()
\ No newline at end of file
@@ -25,17 +25,15 @@ class SearchReplaceError(ChapterClipError):
 
 def handle_error(error, message=None, exit_code=1):
     """
-    Handles errors gracefully by printing a message and optionally exiting.
+    Handles errors gracefully by writing a message to stderr and optionally exiting.
 
     Args:
         error (Exception): The exception that occurred.
         message (str, optional): Custom error message.
         exit_code (int): Exit code for sys.exit (default 1).
     """
-    if message:
-        print(f"Error: {message}")
-    else:
-        print(f"Error: {str(error)}")
+    # stderr keeps error messages apart from the menus and results on stdout
+    sys.stderr.write(f"Error: {message or str(error)}\n")
 
     if exit_code:
         sys.exit(exit_code)
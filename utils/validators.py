@@ -1,6 +1,21 @@
 import os
 from .error_handler import ValidationError
 
+# Accepted yes/no answers, after lowercasing and stripping
+_YES_NO_ANSWERS = {'y': True, 'yes': True, 'n': False, 'no': False}
+
+# Keys every search-replace term must have, and the (key, type, type name) of
+# each key whose value is checked when present, in the order they are reported
+_REQUIRED_TERM_KEYS = ('original', 'replacement', 'caseSensitive', 'isRegex')
+_TERM_KEY_TYPES = (
+    ('id', str, 'a string'),
+    ('original', str, 'a string'),
+    ('replacement', str, 'a string'),
+    ('caseSensitive', bool, 'a boolean'),
+    ('isRegex', bool, 'a boolean'),
+    ('wholeWord', bool, 'a boolean'),
+)
+
 def validate_epub_file(file_path):
     """
     Validates that the given file path is a valid EPUB file.
@@ -11,9 +26,11 @@ def validate_epub_file(file_path):
     Raises:
         ValidationError: If the file does not exist or is not an EPUB.
     """
-    if not os.path.exists(file_path):
+    # isfile is a single stat call, and also rejects directories
+    if not os.path.isfile(file_path):
         raise ValidationError(f"File does not exist: {file_path}")
-    if not file_path.lower().endswith('.epub'):
+    # Only the extension needs lowercasing, not the whole path
+    if file_path[-5:].lower() != '.epub':
         raise ValidationError("File must be an EPUB file (.epub)")
 
 def validate_chapter_number(chapter_num, max_chapters=None):
@@ -72,13 +89,10 @@ def validate_yes_no_input(user_input):
     Raises:
         ValidationError: If input is invalid.
     """
-    user_input = user_input.lower().strip()
-    if user_input in ['y', 'yes']:
-        return True
-    elif user_input in ['n', 'no']:
-        return False
-    else:
+    answer = _YES_NO_ANSWERS.get(user_input.lower().strip())
+    if answer is None:
         raise ValidationError("Please enter 'y' or 'n'")
+    return answer
 
 
 def validate_json_file(file_path):
@@ -91,9 +105,9 @@ def validate_json_file(file_path):
     Raises:
         ValidationError: If the file does not exist or is not a JSON file.
     """
-    if not os.path.exists(file_path):
+    if not os.path.isfile(file_path):
         raise ValidationError(f"File does not exist: {file_path}")
-    if not file_path.lower().endswith('.json'):
+    if file_path[-5:].lower() != '.json':
         raise ValidationError("File must be a JSON file (.json)")
 
 
@@ -110,22 +124,12 @@ def validate_search_replace_term(term):
     Raises:
         ValidationError: If validation fails.
     """
-    required_keys = ['original', 'replacement', 'caseSensitive', 'isRegex']
-    for key in required_keys:
+    for key in _REQUIRED_TERM_KEYS:
         if key not in term:
             raise ValidationError(f"Missing required key: {key}")
 
-    if 'id' in term and not isinstance(term['id'], str):
-        raise ValidationError("Key 'id' must be a string")
-    if not isinstance(term['original'], str):
-        raise ValidationError("Key 'original' must be a string")
-    if not isinstance(term['replacement'], str):
-        raise ValidationError("Key 'replacement' must be a string")
-    if not isinstance(term['caseSensitive'], bool):
-        raise ValidationError("Key 'caseSensitive' must be a boolean")
-    if not isinstance(term['isRegex'], bool):
-        raise ValidationError("Key 'isRegex' must be a boolean")
-    if 'wholeWord' in term and not isinstance(term['wholeWord'], bool):
-        raise ValidationError("Key 'wholeWord' must be a boolean")
+    for key, value_type, type_name in _TERM_KEY_TYPES:
+        if key in term and not isinstance(term[key], value_type):
+            raise ValidationError(f"Key '{key}' must be {type_name}")
 
     return term
\ No newline at end of file